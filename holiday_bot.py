@@ -7,9 +7,13 @@ import requests
 import json
 import time
 import os
-import pytz
+import atexit
+import signal
+import hashlib
+import pickle
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 # ================= LOGGING =================
 
@@ -42,6 +46,12 @@ PAGE_SIZE = 6
 SENT_ALERT_RETENTION_DAYS = 60
 CACHE_RETENTION_DAYS = 3
 
+STATE_FILES = ["subscriptions.json", "sent_alerts.json", "holiday_cache.json"]
+SNAPSHOT_FILE = "state_snapshot.pickle"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_PROTOCOL = 5
+SNAPSHOT_INTERVAL = 600
+
 # ================= COUNTRIES =================
 
 COUNTRIES = {
@@ -103,21 +113,134 @@ POPULAR_TIMEZONES = [
     "America/Bogota"
 ]
 
+# ================= LAZY MODULES =================
+
+_pytz = None
+
+def tzdb():
+    global _pytz
+    if _pytz is None:
+        import pytz
+        _pytz = pytz
+    return _pytz
+
 # ================= FILE UTILS =================
 
-def load_json(name):
-    if not os.path.exists(name):
+# name -> (file signature, parsed data). The parsed data is owned by this
+# cache: load_json hands out copies, and save_json takes over the object
+# it is given, so callers must not keep mutating it after saving.
+_state = {}
+_snapshot_dirty = False
+
+def file_signature(name):
+    try:
+        st = os.stat(name)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def file_digest(name):
+    try:
+        with open(name, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def cached_state(name):
+    # Shared, read-only view of a state file; use load_json to get a
+    # copy that is safe to modify
+    sig = file_signature(name)
+    if sig is None:
         return {}
+
+    cached = _state.get(name)
+    if cached and cached[0] == sig:
+        return cached[1]
+
     try:
         with open(name, "r") as f:
-            return json.load(f)
+            data = json.load(f)
     except:
         logging.warning(f"{name} corrupted, resetting")
         return {}
 
+    _state[name] = (sig, data)
+    return data
+
+def load_json(name):
+    return pickle.loads(pickle.dumps(cached_state(name), protocol=SNAPSHOT_PROTOCOL))
+
 def save_json(name, data):
+    global _snapshot_dirty
     with open(name, "w") as f:
         json.dump(data, f, indent=2)
+    _state[name] = (file_signature(name), data)
+    if name in STATE_FILES:
+        _snapshot_dirty = True
+
+# ================= SNAPSHOT =================
+
+def load_snapshot():
+    if not os.path.exists(SNAPSHOT_FILE):
+        return 0
+
+    # JSON files stay the source of truth: a snapshot entry is only used
+    # if the file content still hashes to what the snapshot was taken from,
+    # which also holds for files copied over on a redeploy
+    try:
+        with open(SNAPSHOT_FILE, "rb") as f:
+            snapshot = pickle.load(f)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return 0
+
+        loaded = {}
+        for name, (digest, data) in snapshot["files"].items():
+            if name not in STATE_FILES or not isinstance(data, dict):
+                continue
+            sig = file_signature(name)
+            if sig is not None and file_digest(name) == digest:
+                loaded[name] = (sig, data)
+    except Exception as e:
+        logging.warning(f"{SNAPSHOT_FILE} unreadable, ignoring: {e}")
+        return 0
+
+    _state.update(loaded)
+    return len(loaded)
+
+def save_snapshot():
+    global _snapshot_dirty
+    files = {}
+    for name in STATE_FILES:
+        cached = _state.get(name)
+        if cached and cached[0] == file_signature(name):
+            files[name] = (file_digest(name), cached[1])
+
+    tmp = SNAPSHOT_FILE + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(
+                {"version": SNAPSHOT_VERSION, "files": files},
+                f,
+                protocol=SNAPSHOT_PROTOCOL
+            )
+        os.replace(tmp, SNAPSHOT_FILE)
+        _snapshot_dirty = False
+    except Exception as e:
+        logging.error(f"Snapshot write error: {e}")
+
+def flush_snapshot():
+    if _snapshot_dirty:
+        save_snapshot()
+
+def handle_sigterm(signum, frame):
+    # Turn SIGTERM into a normal exit so atexit handlers run
+    raise SystemExit(0)
+
+def warm_state():
+    from_snapshot = load_snapshot()
+    for name in STATE_FILES:
+        cached_state(name)
+    return from_snapshot
 
 # ================= USER MODEL =================
 
@@ -271,7 +394,7 @@ def clean_sent_alerts():
     save_json("sent_alerts.json", new_sent)
 
 def clean_cache():
-    cache = load_json("holiday_cache.json")
+    cache = cached_state("holiday_cache.json")
     today = datetime.utcnow()
 
     new_cache = {}
@@ -334,24 +457,37 @@ def fetch_holidays(country):
         return []
 
 def get_cached_holidays(country):
-    cache = load_json("holiday_cache.json")
+    # Returns the in-memory calendar entry itself; callers only read it
+    cache = cached_state("holiday_cache.json")
     today_str = datetime.utcnow().strftime("%Y-%m-%d")
 
     if country in cache and cache[country]["date"] == today_str:
         return cache[country]["holidays"]
 
     holidays = fetch_holidays(country)
+    cache = dict(cache)
     cache[country] = {"date": today_str, "holidays": holidays}
     save_json("holiday_cache.json", cache)
     return holidays
 
 # ================= ALERTS =================
 
+_timezones = {}
+
 def safe_timezone(tz_name):
-    try:
-        return pytz.timezone(tz_name)
-    except:
-        return pytz.UTC
+    tz = _timezones.get(tz_name)
+    if tz is None:
+        pytz = tzdb()
+        try:
+            tz = pytz.timezone(tz_name)
+        except:
+            tz = pytz.UTC
+        _timezones[tz_name] = tz
+    return tz
+
+@lru_cache(maxsize=4096)
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
 
 def send_daily_alerts():
     data = load_json("subscriptions.json")
@@ -363,7 +499,7 @@ def send_daily_alerts():
         today = datetime.now(tz).date()
 
         if user["mute_until"]:
-            if today <= datetime.strptime(user["mute_until"], "%Y-%m-%d").date():
+            if today <= parse_date(user["mute_until"]):
                 continue
 
         alert_days = ALERT_PRESETS.get(user["alert_preset"], [14,7,3,1])
@@ -372,7 +508,7 @@ def send_daily_alerts():
             holidays = get_cached_holidays(country)
 
             for h in holidays:
-                h_date = datetime.strptime(h["date"], "%Y-%m-%d").date()
+                h_date = parse_date(h["date"])
                 delta = (h_date - today).days
 
                 if delta in alert_days:
@@ -414,7 +550,7 @@ def send_weekly_digest():
         for country in user["subscriptions"]:
             holidays = get_cached_holidays(country)
             for h in holidays:
-                h_date = datetime.strptime(h["date"], "%Y-%m-%d").date()
+                h_date = parse_date(h["date"])
                 if 0 <= (h_date - today).days <= 14:
                     upcoming.append((h_date, country, h["name"]))
 
@@ -451,7 +587,7 @@ def send_monthly_overview(chat_id):
         holidays = get_cached_holidays(country)
 
         for h in holidays:
-            h_date = datetime.strptime(h["date"], "%Y-%m-%d").date()
+            h_date = parse_date(h["date"])
 
             if 0 <= (h_date - today).days <= 31:
                 result.setdefault(country, []).append((h_date, h["name"]))
@@ -479,8 +615,24 @@ def send_monthly_overview(chat_id):
 
 if __name__ == "__main__":
 
+    # CPU time so far is interpreter startup plus module imports
+    imports_took = time.process_time()
+    boot_started = time.perf_counter()
+
     offset = None
     last_day = None
+    last_snapshot = time.monotonic()
+    first_update_handled = False
+
+    atexit.register(flush_snapshot)
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    from_snapshot = warm_state()
+    logging.info(
+        f"Imports took {imports_took:.3f}s, state ready in "
+        f"{time.perf_counter() - boot_started:.3f}s "
+        f"({from_snapshot}/{len(STATE_FILES)} files from snapshot)"
+    )
 
     while True:
         updates = get_updates(offset)
@@ -658,6 +810,14 @@ if __name__ == "__main__":
                         f"🌍 Total Subscriptions: {subs}"
                     )
 
+            if not first_update_handled:
+                first_update_handled = True
+                since_boot = time.perf_counter() - boot_started
+                logging.info(
+                    f"First update handled {since_boot:.3f}s after imports "
+                    f"(~{imports_took + since_boot:.3f}s after process start)"
+                )
+
         # ===== DAILY TASKS =====
 
         today_utc = datetime.utcnow().date()
@@ -668,5 +828,11 @@ if __name__ == "__main__":
             send_daily_alerts()
             send_weekly_digest()
             last_day = today_utc
+            save_snapshot()
+            last_snapshot = time.monotonic()
+
+        elif _snapshot_dirty and time.monotonic() - last_snapshot >= SNAPSHOT_INTERVAL:
+            save_snapshot()
+            last_snapshot = time.monotonic()
 
         time.sleep(5)